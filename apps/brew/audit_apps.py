@@ -1,13 +1,17 @@
 #!/usr/bin/env python3
 
+import os
 import sys
-import subprocess
 import pathlib
 import re
 import shutil
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent.parent / "lib" / "python"))
+import runtime  # noqa: E402
+
 
 def check_dependencies():
     """Check that required commands are available."""
@@ -64,9 +68,44 @@ def parse_brewfile(path: pathlib.Path):
     return formulas, casks, mas_entries, vscode_extensions
 
 
-def run_command(cmd):
-    """Run a command and return its output."""
-    return subprocess.check_output(cmd, text=True)
+def get_brew_prefix():
+    """Homebrew prefix (/opt/homebrew or /usr/local), or None if brew can't say."""
+    prefix = os.environ.get("HOMEBREW_PREFIX")
+    if not prefix:
+        result = runtime.run(["brew", "--prefix"], timeout=30)
+        prefix = result.stdout.strip() if result.ok else ""
+    return pathlib.Path(prefix) if prefix else None
+
+
+def get_cache_paths():
+    """Paths whose changes mean installed packages may have changed.
+
+    Installing or removing a formula, cask, app or extension adds or removes
+    an entry in one of these directories, which invalidates cached listings.
+    Returns None (don't cache) if the Homebrew prefix can't be found.
+    """
+    brew_prefix = get_brew_prefix()
+    if brew_prefix is None:
+        return None
+    return [
+        brew_prefix / "Cellar",
+        brew_prefix / "Caskroom",
+        pathlib.Path("/Applications"),
+        pathlib.Path.home() / ".vscode" / "extensions",
+    ]
+
+
+def run_commands(cached_cmds, live_cmds):
+    """Run commands concurrently and return their results, in order.
+
+    Results of cached_cmds are reused until get_cache_paths() changes;
+    live_cmds always run.
+    """
+    cache_paths = get_cache_paths()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        cached = pool.submit(runtime.run_many, cached_cmds, timeout=120, cache_paths=cache_paths)
+        live = pool.submit(runtime.run_many, live_cmds, timeout=120)
+        return cached.result() + live.result()
 
 
 def register_optional(path: pathlib.Path, optional_entries, optional_formulas, optional_casks, optional_mas, optional_vscode):
@@ -137,13 +176,28 @@ Required commands: brew, mas
     if optional_work.exists():
         register_optional(optional_work, optional_entries, optional_formulas, optional_casks, optional_mas, optional_vscode)
 
-    # Get installed packages
-    brew_formulas_installed = run_command(["brew", "list", "--formula"]).split()
-    brew_casks_installed = run_command(["brew", "list", "--cask"]).split()
-    brew_leaves = run_command(["brew", "leaves"]).split()
+    # Get installed packages (all listings run at once). `brew leaves` isn't
+    # cached: marking a dependency as installed on request only rewrites its
+    # install receipt, which doesn't touch the cache paths.
+    formula_result, cask_result, mas_result, vscode_result, leaves_result = run_commands(
+        [
+            ["brew", "list", "--formula"],
+            ["brew", "list", "--cask"],
+            ["mas", "list"],
+            ["code", "--list-extensions"],
+        ],
+        [["brew", "leaves"]],
+    )
+    for result in (formula_result, cask_result, leaves_result, mas_result):
+        if not result.ok:
+            raise SystemExit(f"Command failed: {' '.join(result.args)}\n{result.stderr}")
+
+    brew_formulas_installed = formula_result.stdout.split()
+    brew_casks_installed = cask_result.stdout.split()
+    brew_leaves = leaves_result.stdout.split()
 
     # Parse mas output
-    mas_raw = run_command(["mas", "list"]).splitlines()
+    mas_raw = mas_result.stdout.splitlines()
     mas_installed = {}
     for line in mas_raw:
         line = line.strip()
@@ -158,10 +212,10 @@ Required commands: brew, mas
 
     # Get installed VSCode extensions
     vscode_installed = set()
-    try:
-        vscode_raw = run_command(["code", "--list-extensions"]).splitlines()
+    if vscode_result.ok:
+        vscode_raw = vscode_result.stdout.splitlines()
         vscode_installed = set(ext.strip() for ext in vscode_raw if ext.strip())
-    except subprocess.CalledProcessError:
+    else:
         print("Warning: Failed to get VSCode extensions", file=sys.stderr)
 
     # Convert to sets for comparison
@@ -102,22 +102,19 @@ do_settings() {
     mkdir -p "${HOME}/.claude"
     local settings_file="${HOME}/.claude/settings.json"
 
-    # Ensure settings file exists
-    if [[ ! -f "${settings_file}" ]]; then
-        log_info "Creating new settings.json file"
-        echo '{}' >"${settings_file}"
-    fi
-
-    # Backup before modification
-    backup_file "${settings_file}" "claudecode"
-
-    # Use jq to set alwaysThinkingEnabled and enableAllProjectMcpServers to true
-    require_command jq
-
-    local tmp_file
-    tmp_file=$(mktemp)
-    jq '.alwaysThinkingEnabled = true | .enableAllProjectMcpServers = true | .statusLine = {"type": "command", "command": "~/.claude/statuslines/statusline.py"} | .permissions.defaultMode = "acceptEdits"' "${settings_file}" >"${tmp_file}"
-    mv "${tmp_file}" "${settings_file}"
+    # Edit settings.json in place, leaving other keys untouched. The file is
+    # only backed up and written if something changes. Keys starting with "/"
+    # are JSON pointers into nested objects.
+    local update_script="${REPO_ROOT}/lib/python/settings_editor.py"
+    local backup_dir
+    backup_dir="${PATH_MOTHERBOX_BACKUPS}/$(date +%Y%m%d)/claudecode"
+    "${update_script}" --target "${settings_file}" \
+        --backup-dir "${backup_dir}" \
+        --set "alwaysThinkingEnabled=true" \
+        --set "enableAllProjectMcpServers=true" \
+        --set 'statusLine={"type": "command", "command": "~/.claude/statuslines/statusline.py"}' \
+        --set "/permissions/defaultMode=acceptEdits"
+    prune_backups
 
     log_info "Set alwaysThinkingEnabled = true"
     log_info "Set enableAllProjectMcpServers = true"
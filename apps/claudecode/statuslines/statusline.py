@@ -66,9 +66,16 @@ DEFAULT_STYLE = "powerline"
 import argparse
 import json
 import os
-import subprocess
 import sys
 from dataclasses import dataclass
+from pathlib import Path
+
+# Installed as a symlink into ~/.claude/statuslines; resolve back to the repo
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / "lib" / "python"))
+import runtime  # noqa: E402
+
+# The status line redraws constantly; never let a slow repo stall it
+GIT_TIMEOUT = 2.0
 
 # =============================================================================
 # ANSI STYLING
@@ -236,12 +243,11 @@ class ContextInfo:
 # =============================================================================
 def get_git_info(cwd: str) -> GitInfo | None:
     """Get git repository state using single porcelain call."""
-    result = subprocess.run(
+    result = runtime.run(
         ["git", "-C", cwd, "status", "--porcelain=v2", "--branch"],
-        capture_output=True,
-        text=True,
+        timeout=GIT_TIMEOUT,
     )
-    if result.returncode != 0:
+    if not result.ok:
         return None
 
     info = GitInfo()
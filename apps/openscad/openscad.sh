@@ -9,6 +9,10 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 source "${SCRIPT_DIR}/../../lib/bash/common.sh"
 
 VSCODE_SETTINGS="$HOME/Library/Application Support/Code/User/settings.json"
+# Editors whose settings (including every profile) get the OpenSCAD paths.
+# VS Code's own settings file is always created; other editors are only
+# configured if installed.
+EDITOR_TARGETS=("${VSCODE_SETTINGS}" vscode vscode-insiders cursor)
 RECOMMENDED_EXTENSIONS=(
     "antyos.openscad"                    # Syntax highlighting, preview in external OpenSCAD
     "Leathong.openscad-language-support" # Language server with inline preview
@@ -138,22 +142,33 @@ configure_vscode() {
 
     log_info "Configuring VS Code settings for OpenSCAD..."
 
-    # Backup existing settings before modification
-    backup_file "${VSCODE_SETTINGS}" "openscad"
+    local update_script="${REPO_ROOT}/lib/python/settings_editor.py"
+    local backup_dir
+    backup_dir="${PATH_MOTHERBOX_BACKUPS}/$(date +%Y%m%d)/openscad"
 
-    local update_script="${SCRIPT_DIR}/update_vscode_settings.py"
+    local target_args=()
+    for target in "${EDITOR_TARGETS[@]}"; do
+        target_args+=(--target "${target}")
+    done
 
-    if "${update_script}" "${VSCODE_SETTINGS}" "${openscad_binary}"; then
+    # One process updates every editor and profile, backing up only the
+    # files it actually changes
+    if "${update_script}" "${target_args[@]}" \
+        --set "openscad.launchPath=${openscad_binary}" \
+        --set "scad-lsp.launchPath=${openscad_binary}" \
+        --default "scad-lsp.inlinePreview=true" \
+        --backup-dir "${backup_dir}"; then
         log_success "VS Code settings configured"
     else
         log_error "Failed to update VS Code settings"
         return 1
     fi
+    prune_backups
 
     log_info "Configuration added:"
     log_info "  - openscad.launchPath: ${openscad_binary}"
     log_info "  - scad-lsp.launchPath: ${openscad_binary}"
-    log_info "  - scad-lsp.inlinePreview: true"
+    log_info "  - scad-lsp.inlinePreview: true (unless already set)"
 }
 
 test_setup() {
@@ -0,0 +1,103 @@
+#!/usr/bin/env bats
+
+load '../../lib/bash/common_test_helper.bash'
+
+setup() {
+  TEST_TMPDIR="$(mktemp -d)"
+  ORIGINAL_HOME="${HOME:-}"
+  export HOME="${TEST_TMPDIR}/home"
+  mkdir -p "${HOME}"
+
+  SCRIPT_PATH="${BATS_TEST_DIRNAME}/openscad.sh"
+  UPDATE_SCRIPT="${BATS_TEST_DIRNAME}/update_vscode_settings.py"
+  SETTINGS="${TEST_TMPDIR}/settings.json"
+}
+
+teardown() {
+  rm -rf "${TEST_TMPDIR}"
+  if [[ -n "${ORIGINAL_HOME}" ]]; then
+    export HOME="${ORIGINAL_HOME}"
+  else
+    unset HOME
+  fi
+}
+
+# Writes a large settings.json in the style VS Code allows: line and block
+# comments, nested values and trailing commas
+write_large_settings() {
+  {
+    echo "// Generated settings"
+    echo "{"
+    for i in $(seq 1 2000); do
+      echo "    // Setting ${i}"
+      echo "    \"test.setting${i}\": {\"value\": ${i}, \"url\": \"https://example.com//${i}\"}, /* note ${i} */"
+    done
+    echo "    \"openscad.launchPath\": \"/old/openscad\", // keep me"
+    echo "    \"scad-lsp.inlinePreview\": false,"
+    echo "}"
+  } >"${SETTINGS}"
+}
+
+@test "openscad.sh shows help with no arguments" {
+  run bash "${SCRIPT_PATH}"
+  [ "$status" -eq 0 ]
+  [[ "$output" == *"Usage:"* ]]
+}
+
+@test "update_vscode_settings.py creates settings file when missing" {
+  run python3 "${UPDATE_SCRIPT}" "${TEST_TMPDIR}/new/settings.json" /opt/openscad
+  [ "$status" -eq 0 ]
+
+  run python3 -c 'import json, sys; print(json.load(open(sys.argv[1]))["scad-lsp.inlinePreview"])' "${TEST_TMPDIR}/new/settings.json"
+  [ "$output" = "True" ]
+}
+
+@test "update_vscode_settings.py creates a new settings file with umask permissions" {
+  umask 022
+  run python3 "${UPDATE_SCRIPT}" "${SETTINGS}" /opt/openscad
+  [ "$status" -eq 0 ]
+  [ "$(ls -l "${SETTINGS}" | cut -c1-10)" = "-rw-r--r--" ]
+}
+
+@test "update_vscode_settings.py preserves comments in a large settings file" {
+  write_large_settings
+
+  run python3 "${UPDATE_SCRIPT}" "${SETTINGS}" /opt/openscad
+  [ "$status" -eq 0 ]
+
+  # Comments and untouched settings survive
+  [ "$(grep -c '// Setting' "${SETTINGS}")" -eq 2000 ]
+  [ "$(grep -c '/\* note' "${SETTINGS}")" -eq 2000 ]
+  grep -q '"openscad.launchPath": "/opt/openscad", // keep me' "${SETTINGS}"
+  grep -q '"scad-lsp.launchPath": "/opt/openscad"' "${SETTINGS}"
+
+  # Existing inlinePreview choice is respected
+  grep -q '"scad-lsp.inlinePreview": false' "${SETTINGS}"
+  ! grep -q '"scad-lsp.inlinePreview": true' "${SETTINGS}"
+}
+
+@test "update_vscode_settings.py does not rewrite an up-to-date file" {
+  write_large_settings
+  run python3 "${UPDATE_SCRIPT}" "${SETTINGS}" /opt/openscad
+  [ "$status" -eq 0 ]
+
+  cp "${SETTINGS}" "${TEST_TMPDIR}/expected.json"
+  touch -t 200001010000 "${SETTINGS}"
+  touch -t 200001010001 "${TEST_TMPDIR}/marker"
+
+  run python3 "${UPDATE_SCRIPT}" "${SETTINGS}" /opt/openscad
+  [ "$status" -eq 0 ]
+  [[ "$output" == *"already up to date"* ]]
+  [ ! "${SETTINGS}" -nt "${TEST_TMPDIR}/marker" ]
+  cmp -s "${SETTINGS}" "${TEST_TMPDIR}/expected.json"
+}
+
+@test "update_vscode_settings.py writes through a symlinked settings file" {
+  echo '{ "editor.fontSize": 14 }' >"${TEST_TMPDIR}/linked.json"
+  ln -s "${TEST_TMPDIR}/linked.json" "${SETTINGS}"
+
+  run python3 "${UPDATE_SCRIPT}" "${SETTINGS}" /opt/openscad
+  [ "$status" -eq 0 ]
+  [ -L "${SETTINGS}" ]
+  grep -q '"openscad.launchPath": "/opt/openscad"' "${TEST_TMPDIR}/linked.json"
+}
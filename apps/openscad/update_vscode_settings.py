@@ -1,42 +1,37 @@
 #!/usr/bin/env python3
-"""Update VS Code settings.json with OpenSCAD configuration."""
+"""Update VS Code settings.json with OpenSCAD configuration.
+
+A single-file front end to lib/python/settings_editor.py, which does the
+comment-preserving edit. To configure every editor and profile at once, run
+settings_editor.py with --target flags instead (as openscad.sh does).
+"""
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "lib" / "python"))
+from settings_editor import apply_settings  # noqa: E402
 
-def update_settings(settings_file: Path, openscad_path: str) -> None:
-    """Update VS Code settings with OpenSCAD configuration."""
-    # Ensure parent directory exists
-    settings_file.parent.mkdir(parents=True, exist_ok=True)
-
-    # Read existing settings or create new
-    if settings_file.exists():
-        with open(settings_file, "r", encoding="utf-8") as f:
-            settings = json.load(f)
-    else:
-        settings = {}
-
-    # Update OpenSCAD settings
-    settings["openscad.launchPath"] = openscad_path
-    settings["scad-lsp.launchPath"] = openscad_path
 
-    # Optional: Set up inline preview (if not already set)
-    if "scad-lsp.inlinePreview" not in settings:
-        settings["scad-lsp.inlinePreview"] = True
+def update_settings(settings_file: Path, openscad_path: str) -> bool:
+    """Update VS Code settings with OpenSCAD configuration.
 
-    # Write back
-    with open(settings_file, "w", encoding="utf-8") as f:
-        json.dump(settings, f, indent=2)
-        f.write("\n")  # Add trailing newline
+    Returns True if the file was written, False if it was already configured.
+    """
+    return apply_settings(
+        settings_file,
+        values={
+            "openscad.launchPath": openscad_path,
+            "scad-lsp.launchPath": openscad_path,
+        },
+        # Optional: Set up inline preview (if not already set)
+        defaults={"scad-lsp.inlinePreview": True},
+    )
 
 
 def main():
-    parser = argparse.ArgumentParser(
-        description="Update VS Code settings.json with OpenSCAD configuration"
-    )
+    parser = argparse.ArgumentParser(description="Update VS Code settings.json with OpenSCAD configuration")
     parser.add_argument(
         "settings_file",
         type=Path,
@@ -50,8 +45,10 @@ def main():
     args = parser.parse_args()
 
     try:
-        update_settings(args.settings_file, args.openscad_path)
-        print("VS Code settings updated successfully")
+        if update_settings(args.settings_file, args.openscad_path):
+            print("VS Code settings updated successfully")
+        else:
+            print("VS Code settings already up to date")
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
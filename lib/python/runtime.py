@@ -0,0 +1,207 @@
+"""Shared subprocess helpers for the repo's Python scripts.
+
+Scripts add lib/python to sys.path and `import runtime`, then shell out
+through run() (or run_many() to fan out) instead of calling subprocess
+directly. That gets them:
+
+- Deadlines: every command has a timeout, so a hung tool can't hang setup.
+- Caching: pass cache_paths to reuse a previous successful result until one
+  of those files or directories changes (see run()).
+- Tracing: set MOTHERBOX_TRACE to a file path and every command appends a
+  JSON line with its wall time, e.g.
+
+      MOTHERBOX_TRACE=/tmp/trace.jsonl ./run/maintain.sh
+
+  The variable is inherited by child processes, so one trace covers a whole
+  run/setup.sh or run/maintain.sh flow.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+DEFAULT_TIMEOUT = 60.0
+TRACE_ENV = "MOTHERBOX_TRACE"
+CACHE_DIR = Path(os.environ.get("MOTHERBOX_CACHE_DIR", Path.home() / ".cache" / "motherbox" / "commands"))
+
+
+@dataclass
+class CommandResult:
+    """Outcome of a command run through run()."""
+
+    args: list[str]
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float  # seconds of wall time (0.0 for cache hits)
+    timed_out: bool = False
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out
+
+
+def _trace(result: CommandResult, cwd: str | None) -> None:
+    """Append a JSON line for result to $MOTHERBOX_TRACE, if set.
+
+    Silently fails - tracing must never break the script being traced.
+    """
+    trace_path = os.environ.get(TRACE_ENV)
+    if not trace_path:
+        return
+
+    entry = {
+        "ts": time.time(),
+        "pid": os.getpid(),
+        "script": os.path.basename(sys.argv[0]) if sys.argv else "",
+        "cmd": result.args,
+        "cwd": cwd or os.getcwd(),
+        "ms": round(result.duration * 1000, 1),
+        "returncode": result.returncode,
+        "timed_out": result.timed_out,
+        "cached": result.cached,
+    }
+    try:
+        # One write per line on an O_APPEND file keeps lines from concurrent
+        # processes intact
+        with open(trace_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+    except OSError:
+        pass
+
+
+def _path_stamp(path: str | os.PathLike) -> list | None:
+    """mtime and size of a path, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _cache_file(args: list[str], cwd: str | None) -> Path:
+    """Cache entry location for a command.
+
+    There is one entry per command, overwritten when it goes stale, so the
+    cache doesn't grow as the invalidation paths change.
+    """
+    key = {"args": args, "cwd": cwd}
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def _path_stamps(cache_paths: Iterable) -> dict:
+    return {str(p): _path_stamp(p) for p in cache_paths}
+
+
+def _read_cache(cache_file: Path, stamps: dict) -> CommandResult | None:
+    """Cached result, or None if there is none or its paths have changed since."""
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.pop("stamps", None) != stamps:
+            return None
+        return CommandResult(**{**data, "duration": 0.0, "cached": True})
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
+
+
+def _write_cache(cache_file: Path, result: CommandResult, stamps: dict) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({**asdict(result), "stamps": stamps}, f)
+        os.replace(tmp_name, cache_file)
+    except OSError:
+        pass
+
+
+def run(
+    args: Sequence[str],
+    *,
+    timeout: float | None = DEFAULT_TIMEOUT,
+    check: bool = False,
+    cwd: str | None = None,
+    cache_paths: Iterable[str | os.PathLike] | None = None,
+) -> CommandResult:
+    """Run a command, capturing text output, within a deadline.
+
+    Args:
+        args: Command and arguments
+        timeout: Seconds before the command is killed (None for no limit)
+        check: Raise CalledProcessError / TimeoutExpired on failure instead
+            of returning the failed result
+        cwd: Working directory for the command
+        cache_paths: Files or directories whose mtime and size invalidate a
+            cached result. When given, a successful result is stored on disk
+            and reused while none of them have changed. Leave as None for
+            commands whose output must always be live.
+
+    A command that isn't installed is reported as returncode 127, the way a
+    shell would, rather than raising.
+    """
+    args = [str(a) for a in args]
+
+    cache_file = None
+    if cache_paths is not None:
+        cache_file = _cache_file(args, cwd)
+        # Stamped before running, so a change made while the command runs
+        # invalidates its result next time
+        stamps = _path_stamps(cache_paths)
+        hit = _read_cache(cache_file, stamps)
+        if hit:
+            _trace(hit, cwd)
+            return hit
+
+    started = time.monotonic()
+    try:
+        proc = subprocess.run(args, capture_output=True, text=True, cwd=cwd, timeout=timeout)
+        result = CommandResult(args, proc.returncode, proc.stdout, proc.stderr, time.monotonic() - started)
+    except subprocess.TimeoutExpired as e:
+        stdout = e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else e.stdout or ""
+        stderr = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else e.stderr or ""
+        result = CommandResult(args, -1, stdout, stderr, time.monotonic() - started, timed_out=True)
+    except FileNotFoundError as e:
+        result = CommandResult(args, 127, "", str(e), time.monotonic() - started)
+
+    _trace(result, cwd)
+
+    if result.ok and cache_file:
+        _write_cache(cache_file, result, stamps)
+
+    if check and result.timed_out:
+        raise subprocess.TimeoutExpired(args, timeout, result.stdout, result.stderr)
+    if check and result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, args, result.stdout, result.stderr)
+
+    return result
+
+
+def run_many(
+    commands: Sequence[Sequence[str]],
+    *,
+    max_workers: int = 8,
+    **kwargs,
+) -> list[CommandResult]:
+    """Run commands concurrently, returning results in the same order.
+
+    Takes the same keyword arguments as run(), applied to every command. With
+    check=True the first failure (in command order) is raised once all
+    commands have finished.
+    """
+    if not commands:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(commands))) as pool:
+        futures = [pool.submit(run, cmd, **kwargs) for cmd in commands]
+        return [future.result() for future in futures]
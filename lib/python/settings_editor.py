@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+"""Edit JSON settings files in place: VS Code, Cursor, Claude Code and the like.
+
+Applies many settings to many files in one go: every VS Code, Insiders and
+Cursor profile, or any other JSON settings file. Scripts import it (see
+apply_settings) or run it as a command with a spec (see main).
+
+settings.json is JSONC: VS Code allows comments and trailing commas. Rather
+than round-tripping it through json (which would fail on those, and drop
+them anyway), this locates the keys it needs and splices new values into the
+original text. Everything else in the file is left byte-for-byte
+as it was, and the file is not touched at all when the values already match,
+so open editor windows don't reload their settings for nothing.
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+# A string, a line comment, a block comment (which ends at the first "*/"),
+# or a comma followed only by whitespace/comments up to a closing bracket
+# (i.e. a trailing comma)
+_JSONC_TOKEN_RE = re.compile(
+    r'"(?:[^"\\\n]|\\.)*"|//[^\n]*|/\*(?:(?!\*/).)*\*/|,(?=(?:\s|//[^\n]*|/\*(?:(?!\*/).)*\*/)*[}\]])',
+    re.DOTALL,
+)
+_STRING_RE = re.compile(r'"(?:[^"\\\n]|\\.)*"')
+# Runs of characters that can't open or close a nested value inside brackets
+_NESTED_PLAIN_RE = re.compile(r'[^"{}\[\]/]+')
+_LITERAL_RE = re.compile(r"[^\s,:\]}/]+")
+
+_WHITESPACE = " \t\r\n\ufeff"
+_DEFAULT_INDENT = "    "
+
+
+@dataclass
+class _Member:
+    """Location of one top-level "key": value pair in the settings text."""
+
+    key: str
+    key_start: int
+    value_start: int
+    value_end: int
+    has_comma: bool
+
+
+def load_jsonc(text: str) -> dict:
+    """Parse JSONC text (comments and trailing commas allowed) into a dict."""
+
+    def strip(match: re.Match) -> str:
+        token = match.group()
+        return token if token.startswith('"') else ""
+
+    stripped = _JSONC_TOKEN_RE.sub(strip, text).strip(_WHITESPACE)
+    if not stripped:
+        return {}
+    data = json.loads(stripped)
+    if not isinstance(data, dict):
+        raise ValueError("Settings file must contain a JSON object")
+    return data
+
+
+def _skip_trivia(text: str, pos: int) -> int:
+    """Skip whitespace and comments starting at pos."""
+    n = len(text)
+    while pos < n:
+        if text[pos] in _WHITESPACE:
+            pos += 1
+        elif text.startswith("//", pos):
+            end = text.find("\n", pos)
+            pos = n if end == -1 else end
+        elif text.startswith("/*", pos):
+            end = text.find("*/", pos + 2)
+            if end == -1:
+                raise ValueError(f"Unterminated comment at offset {pos}")
+            pos = end + 2
+        else:
+            break
+    return pos
+
+
+def _skip_string(text: str, pos: int) -> int:
+    """Return the offset just past the string starting at pos."""
+    m = _STRING_RE.match(text, pos)
+    if not m:
+        raise ValueError(f"Invalid string at offset {pos}")
+    return m.end()
+
+
+def _skip_value(text: str, pos: int) -> int:
+    """Return the offset just past the value starting at pos."""
+    if pos >= len(text):
+        raise ValueError("Unexpected end of settings file")
+
+    char = text[pos]
+    if char == '"':
+        return _skip_string(text, pos)
+
+    if char in "{[":
+        depth = 0
+        n = len(text)
+        while pos < n:
+            m = _NESTED_PLAIN_RE.match(text, pos)
+            if m:
+                pos = m.end()
+                continue
+            char = text[pos]
+            if char == '"':
+                pos = _skip_string(text, pos)
+            elif char == "/":
+                end = _skip_trivia(text, pos)
+                if end == pos:
+                    raise ValueError(f"Unexpected '/' at offset {pos}")
+                pos = end
+            else:
+                depth += 1 if char in "{[" else -1
+                pos += 1
+                if depth == 0:
+                    return pos
+        raise ValueError("Unterminated object or array in settings file")
+
+    m = _LITERAL_RE.match(text, pos)
+    if not m:
+        raise ValueError(f"Unexpected character {char!r} at offset {pos}")
+    return m.end()
+
+
+def _object_members(text: str, pos: int) -> tuple[list[_Member], int]:
+    """Locate the members of the object whose "{" is at pos.
+
+    Returns (members, offset of the matching "}").
+    """
+    pos += 1
+    members = []
+    while True:
+        pos = _skip_trivia(text, pos)
+        if pos >= len(text):
+            raise ValueError("Unterminated object in settings file")
+        if text[pos] == "}":
+            return members, pos
+
+        key_start = pos
+        key_end = _skip_string(text, pos)
+        key = json.loads(text[key_start:key_end])
+
+        pos = _skip_trivia(text, key_end)
+        if pos >= len(text) or text[pos] != ":":
+            raise ValueError(f"Expected ':' after key {key!r}")
+
+        value_start = _skip_trivia(text, pos + 1)
+        value_end = _skip_value(text, value_start)
+
+        pos = _skip_trivia(text, value_end)
+        has_comma = pos < len(text) and text[pos] == ","
+        if has_comma:
+            pos += 1
+        elif pos >= len(text) or text[pos] != "}":
+            raise ValueError(f"Expected ',' or '}}' after value of {key!r}")
+
+        members.append(_Member(key, key_start, value_start, value_end, has_comma))
+
+
+def _detect_indent(text: str, members: list[_Member], fallback: str) -> str:
+    """Indentation used for an object's keys, or fallback if it can't be told."""
+    if members:
+        key_start = members[0].key_start
+        line_start = text.rfind("\n", 0, key_start) + 1
+        indent = text[line_start:key_start]
+        if indent and not indent.strip(" \t"):
+            return indent
+    return fallback
+
+
+def _render(value, unit: str, indent: str) -> str:
+    """Render a value as JSON for a key indented by indent."""
+    rendered = json.dumps(value, indent=unit, ensure_ascii=False)
+    return rendered.replace("\n", "\n" + indent)
+
+
+def parse_key(key: str) -> tuple[str, ...]:
+    """Split a settings key into a path of object keys.
+
+    Keys are top-level VS Code style keys ("editor.fontSize") unless they
+    start with "/", in which case they are JSON pointers into nested objects
+    ("/permissions/defaultMode").
+    """
+    if not key.startswith("/"):
+        return (key,)
+    return tuple(part.replace("~1", "/").replace("~0", "~") for part in key[1:].split("/"))
+
+
+def _build_value(updates: list[tuple[tuple[str, ...], object]]) -> object:
+    """Build a fresh value for a key from (remaining path, value) updates."""
+    result = None
+    for path, value in updates:
+        if not path:
+            result = value
+            continue
+        if not isinstance(result, dict):
+            result = {}
+        node = result
+        for part in path[:-1]:
+            if not isinstance(node.get(part), dict):
+                node[part] = {}
+            node = node[part]
+        node[path[-1]] = value
+    return result
+
+
+def _object_edits(
+    text: str,
+    open_pos: int,
+    updates: list[tuple[tuple[str, ...], object]],
+    unit: str | None,
+    parent_indent: str,
+) -> list[tuple[int, int, str]]:
+    """Splices that apply path updates to the object whose "{" is at open_pos.
+
+    Existing keys have just their value replaced (the last occurrence, which
+    is the one VS Code honours); nested paths descend into existing objects;
+    new keys are appended after the last member, on the same line when the
+    object is written on one line.
+    """
+    members, close_pos = _object_members(text, open_pos)
+    if unit is None:
+        unit = _detect_indent(text, members, _DEFAULT_INDENT)
+    indent = _detect_indent(text, members, parent_indent + unit)
+    by_key = {m.key: m for m in members}
+
+    grouped: dict[str, list[tuple[tuple[str, ...], object]]] = {}
+    for path, value in updates:
+        grouped.setdefault(path[0], []).append((path[1:], value))
+
+    edits = []
+    new_members = []
+    inline_members = []
+    for key, key_updates in grouped.items():
+        member = by_key.get(key)
+        replaces_whole = any(not path for path, _ in key_updates)
+
+        if member and not replaces_whole and text[member.value_start] == "{":
+            edits.extend(_object_edits(text, member.value_start, key_updates, unit, indent))
+            continue
+
+        value = _build_value(key_updates)
+        rendered = _render(value, unit, indent)
+        if member:
+            edits.append((member.value_start, member.value_end, rendered))
+        else:
+            new_members.append(f"{indent}{json.dumps(key, ensure_ascii=False)}: {rendered}")
+            inline_members.append((key, value))
+
+    if new_members and "\n" not in text[open_pos:close_pos]:
+        # An object written on one line gets its new members on that line too
+        head_end = len(text[:close_pos].rstrip(" \t"))
+        inline = [
+            f"{json.dumps(key, ensure_ascii=False)}: {json.dumps(value, ensure_ascii=False)}"
+            for key, value in inline_members
+        ]
+        if members:
+            edits.append((head_end, head_end, " " + ", ".join(inline)))
+        else:
+            edits.append((head_end, close_pos, ", ".join(inline)))
+        if members and not members[-1].has_comma:
+            last_end = members[-1].value_end
+            edits.append((last_end, last_end, ","))
+    elif new_members:
+        # Comments after the last member stay where they are, above the new ones
+        head_end = len(text[:close_pos].rstrip(" \t\r\n"))
+        edits.append((head_end, close_pos, "\n" + ",\n".join(new_members) + "\n" + parent_indent))
+        if members and not members[-1].has_comma:
+            last_end = members[-1].value_end
+            edits.append((last_end, last_end, ","))
+
+    return edits
+
+
+def set_values(text: str, values: dict) -> str:
+    """Return text with each key (see parse_key) set to its value, touching nothing else.
+
+    The text is scanned once however many keys are set.
+    """
+    if not values:
+        return text
+
+    open_pos = _skip_trivia(text, 0)
+    if open_pos >= len(text) or text[open_pos] != "{":
+        raise ValueError("Settings file must contain a JSON object")
+
+    updates = [(parse_key(key), value) for key, value in values.items()]
+    edits = _object_edits(text, open_pos, updates, None, "")
+
+    # Stable sort: when the comma and the new members land on the same
+    # offset, the members go in first so the comma ends up before them
+    for start, end, replacement in sorted(edits, key=lambda edit: edit[:2], reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """Write text to path via a temp file and rename, so readers never see a partial file.
+
+    Symlinks are followed, so a settings.json linked into this repo stays a link.
+    """
+    target = path.resolve()
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        if target.exists():
+            shutil.copymode(target, tmp_name)
+        else:
+            # mkstemp creates 0600; give a new file the mode open() would
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, target)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.unlink(tmp_name)
+        raise
+
+
+_MISSING = object()
+
+
+def _lookup(data: dict, path: tuple[str, ...]) -> object:
+    """Value at path in parsed settings, or _MISSING."""
+    node = data
+    for part in path:
+        if not isinstance(node, dict) or part not in node:
+            return _MISSING
+        node = node[part]
+    return node
+
+
+def _backup(path: Path, backup_dir: Path) -> Path:
+    """Copy path into backup_dir as <filename>.<timestamp>, like backup_file in lib/bash/common.sh.
+
+    Profiles all name their file settings.json, so a name already taken this
+    second gets a .1, .2, ... suffix rather than being overwritten.
+    """
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    base = f"{path.name}.{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    backup_path = backup_dir / base
+    suffix = 0
+    while True:
+        try:
+            with open(path, "rb") as src, open(backup_path, "xb") as dst:
+                shutil.copyfileobj(src, dst)
+            break
+        except FileExistsError:
+            suffix += 1
+            backup_path = backup_dir / f"{base}.{suffix}"
+    # Mode only: the backup keeps a fresh mtime, like backup_file's cp, so
+    # prune_backups doesn't delete it straight away for an old settings file
+    shutil.copymode(path, backup_path)
+    return backup_path
+
+
+def apply_settings(
+    settings_file: Path,
+    values: dict,
+    defaults: dict | None = None,
+    backup_dir: Path | None = None,
+) -> bool:
+    """Set values (and defaults, only where absent) in a settings file.
+
+    Keys are as described in parse_key. If backup_dir is given, the existing
+    file is copied there (see _backup) before it is changed.
+
+    Returns True if the file was written, False if it already matched.
+    """
+    if settings_file.exists():
+        with open(settings_file, "r", encoding="utf-8", newline="") as f:
+            original = f.read()
+    else:
+        original = ""
+
+    text = original if original.strip(_WHITESPACE) else "{\n}\n"
+    current = load_jsonc(text)
+
+    changes = {}
+    for key, value in values.items():
+        existing = _lookup(current, parse_key(key))
+        if existing is _MISSING or json.dumps(existing, sort_keys=True) != json.dumps(value, sort_keys=True):
+            changes[key] = value
+    for key, value in (defaults or {}).items():
+        if _lookup(current, parse_key(key)) is _MISSING:
+            changes.setdefault(key, value)
+
+    text = set_values(text, changes)
+
+    if text == original:
+        return False
+
+    if backup_dir and original:
+        backup_path = _backup(settings_file, backup_dir)
+        print(f"Backed up {settings_file.name} to {backup_path}")
+
+    settings_file.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic(settings_file, text)
+    return True
+
+
+# =============================================================================
+# SPECS
+# =============================================================================
+# A spec is a JSON object, or a list of them, shaped like:
+#
+#   {
+#     "targets": ["vscode", "cursor", "~/.claude/settings.json"],
+#     "set": {"openscad.launchPath": "/path", "/permissions/defaultMode": "acceptEdits"},
+#     "defaults": {"scad-lsp.inlinePreview": true}
+#   }
+#
+# "set" keys are always written; "defaults" only where the key is absent.
+# Targets are editor names (see EDITOR_DIRS) or settings file paths.
+EDITOR_DIRS = {
+    "vscode": "Code",
+    "vscode-insiders": "Code - Insiders",
+    "cursor": "Cursor",
+}
+EDITOR_SUPPORT_DIR = Path.home() / "Library" / "Application Support"
+
+
+def resolve_targets(targets: list[str]) -> list[Path]:
+    """Expand editor names and paths into settings files.
+
+    An editor name covers its User/settings.json and the settings.json of
+    every profile under User/profiles/. Editors that aren't installed are
+    skipped; explicit paths are kept whether or not they exist yet.
+    """
+    files = []
+    for target in targets:
+        if target not in EDITOR_DIRS:
+            files.append(Path(target).expanduser())
+            continue
+
+        user_dir = EDITOR_SUPPORT_DIR / EDITOR_DIRS[target] / "User"
+        if not user_dir.is_dir():
+            continue
+        files.append(user_dir / "settings.json")
+        profiles_dir = user_dir / "profiles"
+        if profiles_dir.is_dir():
+            files.extend(p / "settings.json" for p in sorted(profiles_dir.iterdir()) if p.is_dir())
+    return files
+
+
+def plan_spec(spec: dict | list[dict]) -> dict[Path, tuple[dict, dict]]:
+    """Merge spec entries into {settings file: (values, defaults)}.
+
+    Files reached through more than one entry or symlink are merged so each
+    is read and written exactly once; later entries win.
+    """
+    entries = spec if isinstance(spec, list) else [spec]
+    plan: dict[str, tuple[Path, dict, dict]] = {}
+    for entry in entries:
+        unknown = set(entry) - {"targets", "set", "defaults"}
+        if unknown:
+            raise ValueError(f"Unknown spec field(s): {', '.join(sorted(unknown))}")
+        for path in resolve_targets(entry.get("targets", [])):
+            _, values, defaults = plan.setdefault(os.path.realpath(path), (path, {}, {}))
+            values.update(entry.get("set", {}))
+            defaults.update(entry.get("defaults", {}))
+    return {path: (values, defaults) for path, values, defaults in plan.values()}
+
+
+def apply_spec(spec: dict | list[dict], backup_dir: Path | None = None) -> list[tuple[Path, bool | Exception]]:
+    """Apply a spec to all of its settings files in parallel.
+
+    Returns (file, outcome) pairs in target order, where outcome is True if
+    the file changed, False if it already matched, or the error raised.
+    """
+    plan = plan_spec(spec)
+    if not plan:
+        return []
+
+    def apply(item: tuple[Path, tuple[dict, dict]]) -> bool | Exception:
+        path, (values, defaults) = item
+        try:
+            return apply_settings(path, values, defaults, backup_dir)
+        except Exception as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(8, len(plan))) as pool:
+        outcomes = list(pool.map(apply, plan.items()))
+    return list(zip(plan, outcomes))
+
+
+def _parse_assignment(assignment: str) -> tuple[str, object]:
+    """Parse KEY=VALUE, taking VALUE as JSON if it parses and as a string otherwise."""
+    key, sep, raw = assignment.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got '{assignment}'")
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply a batch of settings to many JSON/JSONC settings files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Takes a JSON spec (--spec) or the equivalent --target/--set/--default flags.
+Targets are settings file paths or editor names ({", ".join(EDITOR_DIRS)}),
+which cover the editor's settings.json and every profile under User/profiles/.
+Keys starting with "/" are JSON pointers into nested objects.
+
+Example:
+  %(prog)s --target vscode --target cursor \\
+      --set openscad.launchPath=/path/to/openscad --default scad-lsp.inlinePreview=true
+""",
+    )
+    parser.add_argument(
+        "--spec",
+        metavar="FILE",
+        help="JSON spec of targets, settings and defaults ('-' for stdin)",
+    )
+    parser.add_argument(
+        "--target",
+        action="append",
+        default=[],
+        help="Settings file or editor name to update (repeatable)",
+    )
+    parser.add_argument(
+        "--set",
+        dest="values",
+        metavar="KEY=VALUE",
+        type=_parse_assignment,
+        action="append",
+        default=[],
+        help="Setting to write; VALUE is JSON, or a plain string (repeatable)",
+    )
+    parser.add_argument(
+        "--default",
+        dest="defaults",
+        metavar="KEY=VALUE",
+        type=_parse_assignment,
+        action="append",
+        default=[],
+        help="Setting to write only if absent (repeatable)",
+    )
+    parser.add_argument(
+        "--backup-dir",
+        type=Path,
+        help="Copy each file here before changing it",
+    )
+
+    args = parser.parse_args()
+    if not args.spec and not args.target:
+        parser.error("--spec or at least one --target is required")
+
+    try:
+        if args.spec:
+            if args.spec == "-":
+                spec = json.load(sys.stdin)
+            else:
+                with open(args.spec, "r", encoding="utf-8") as f:
+                    spec = json.load(f)
+            spec = spec if isinstance(spec, list) else [spec]
+        else:
+            spec = []
+        if args.target:
+            spec.append({"targets": args.target, "set": dict(args.values), "defaults": dict(args.defaults)})
+        results = apply_spec(spec, args.backup_dir)
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not results:
+        print("ERROR: no settings files found for the given targets", file=sys.stderr)
+        sys.exit(1)
+
+    failed = 0
+    for path, outcome in results:
+        if isinstance(outcome, Exception):
+            print(f"ERROR: {path}: {outcome}", file=sys.stderr)
+            failed += 1
+        else:
+            print(f"{'updated' if outcome else 'unchanged'}: {path}")
+
+    changed = sum(1 for _, outcome in results if outcome is True)
+    print(f"{changed} of {len(results)} settings file(s) updated")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env bats
+
+load 'bash/common_test_helper.bash'
+
+setup() {
+  TEST_TMPDIR="$(mktemp -d)"
+  ORIGINAL_HOME="${HOME:-}"
+  export HOME="${TEST_TMPDIR}/home"
+  mkdir -p "${HOME}"
+
+  EDITOR_SCRIPT="${BATS_TEST_DIRNAME}/python/settings_editor.py"
+  SETTINGS="${TEST_TMPDIR}/settings.json"
+}
+
+teardown() {
+  rm -rf "${TEST_TMPDIR}"
+  if [[ -n "${ORIGINAL_HOME}" ]]; then
+    export HOME="${ORIGINAL_HOME}"
+  else
+    unset HOME
+  fi
+}
+
+@test "settings_editor.py updates every editor profile in one run" {
+  local support="${HOME}/Library/Application Support"
+  mkdir -p "${support}/Code/User/profiles/abc123" "${support}/Cursor/User"
+  printf '{\n    // keep\n    "scad-lsp.inlinePreview": false,\n}\n' >"${support}/Code/User/settings.json"
+
+  run python3 "${EDITOR_SCRIPT}" --target vscode --target cursor --target vscode-insiders \
+    --set openscad.launchPath=/opt/openscad --default scad-lsp.inlinePreview=true
+  [ "$status" -eq 0 ]
+  [[ "$output" == *"3 of 3 settings file(s) updated"* ]]
+
+  grep -q '// keep' "${support}/Code/User/settings.json"
+  grep -q '"scad-lsp.inlinePreview": false' "${support}/Code/User/settings.json"
+  grep -q '"openscad.launchPath": "/opt/openscad"' "${support}/Code/User/profiles/abc123/settings.json"
+  grep -q '"scad-lsp.inlinePreview": true' "${support}/Cursor/User/settings.json"
+
+  run python3 "${EDITOR_SCRIPT}" --target vscode --target cursor \
+    --set openscad.launchPath=/opt/openscad --default scad-lsp.inlinePreview=true
+  [ "$status" -eq 0 ]
+  [[ "$output" == *"0 of 3 settings file(s) updated"* ]]
+}
+
+@test "settings_editor.py sets nested keys from a spec" {
+  echo '{ "permissions": { "allow": ["Bash(ls)"] } }' >"${SETTINGS}"
+  cat >"${TEST_TMPDIR}/spec.json" <<SPEC
+{
+  "targets": ["${SETTINGS}"],
+  "set": {"/permissions/defaultMode": "acceptEdits", "alwaysThinkingEnabled": true}
+}
+SPEC
+
+  run python3 "${EDITOR_SCRIPT}" --spec "${TEST_TMPDIR}/spec.json"
+  [ "$status" -eq 0 ]
+
+  run python3 -c 'import json, sys; d = json.load(open(sys.argv[1])); print(d["permissions"], d["alwaysThinkingEnabled"])' "${SETTINGS}"
+  [ "$output" = "{'allow': ['Bash(ls)'], 'defaultMode': 'acceptEdits'} True" ]
+}
+
+@test "settings_editor.py handles block comments after members" {
+  printf '{\n  "a": 1, /* x */\n  "b": 2 /* y */\n}\n' >"${SETTINGS}"
+
+  run python3 "${EDITOR_SCRIPT}" --target "${SETTINGS}" --set b=3
+  [ "$status" -eq 0 ]
+  [ "$(cat "${SETTINGS}")" = "$(printf '{\n  "a": 1, /* x */\n  "b": 3 /* y */\n}')" ]
+}
+
+@test "settings_editor.py keeps new keys of a one-line object on that line" {
+  printf '{\n  "a": {"c": 1}\n}\n' >"${SETTINGS}"
+
+  run python3 "${EDITOR_SCRIPT}" --target "${SETTINGS}" --set /a/d=3
+  [ "$status" -eq 0 ]
+  [ "$(cat "${SETTINGS}")" = "$(printf '{\n  "a": {"c": 1, "d": 3}\n}')" ]
+}
+
+@test "settings_editor.py fails when no settings files are found" {
+  run python3 "${EDITOR_SCRIPT}" --target cursor --set a=1
+  [ "$status" -eq 1 ]
+  [[ "$output" == *"no settings files found"* ]]
+
+  run python3 "${EDITOR_SCRIPT}" --set a=1
+  [ "$status" -eq 2 ]
+}
+
+@test "settings_editor.py backs up changed files as <filename>.<timestamp>" {
+  echo '{ "a": 1 }' >"${SETTINGS}"
+
+  run python3 "${EDITOR_SCRIPT}" --target "${SETTINGS}" --set a=2 --backup-dir "${TEST_TMPDIR}/backups"
+  [ "$status" -eq 0 ]
+  [[ "$output" == *"Backed up settings.json to"* ]]
+  compgen -G "${TEST_TMPDIR}/backups/settings.json.[0-9]*_[0-9]*" >/dev/null
+}
+
+@test "settings_editor.py backups of old files survive prune_backups" {
+  PATH_MOTHERBOX_CONFIG="${TEST_TMPDIR}/motherbox"
+  PATH_MOTHERBOX_CONFIG_FILE="${PATH_MOTHERBOX_CONFIG}/config"
+  PATH_MOTHERBOX_BACKUPS="${PATH_MOTHERBOX_CONFIG}/backups"
+  echo '{ "a": 1 }' >"${SETTINGS}"
+  touch -t 202501010000 "${SETTINGS}"
+
+  run python3 "${EDITOR_SCRIPT}" --target "${SETTINGS}" --set a=2 --backup-dir "${PATH_MOTHERBOX_BACKUPS}/test"
+  [ "$status" -eq 0 ]
+
+  prune_backups
+  compgen -G "${PATH_MOTHERBOX_BACKUPS}/test/settings.json.*" >/dev/null
+}